@@ -1,14 +1,21 @@
+import gzip
 import importlib
 import io
 import json
 import os
 import sys
 import tempfile
+import threading
 import unittest
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Optional
 from unittest import mock
 
 import requests
+import urllib3
 
 ENV_VARS = {
     "ZOHO_CLIENT_ID": "client",
@@ -19,64 +26,88 @@ ENV_VARS = {
 }
 
 
+@dataclass(slots=True)
 class FakeResponse:
-    def __init__(self, status_code, json_data=None, text=""):
-        self.status_code = status_code
-        self._json = json_data
-        if text:
-            self.text = text
-        elif json_data is not None:
-            self.text = json.dumps(json_data)
-        else:
-            self.text = ""
+    status_code: int
+    json_data: Any = None
+    body: str = ""
+    _content: Optional[bytes] = field(default=None, init=False, repr=False)
+
+    @property
+    def content(self):
+        # Serialise once; slots rule out cached_property. ``body`` wins over
+        # ``json_data`` so ``content`` and ``text`` always describe the same bytes.
+        if self._content is None:
+            if self.body:
+                self._content = self.body.encode("utf-8")
+            elif self.json_data is not None:
+                self._content = json.dumps(self.json_data).encode("utf-8")
+            else:
+                self._content = b""
+        return self._content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
 
     def raise_for_status(self):
         if 400 <= self.status_code < 600:
             raise requests.HTTPError(response=self)
 
     def json(self):
-        if self._json is None:
+        if self.json_data is None:
             raise ValueError("No JSON data available.")
-        return self._json
+        return self.json_data
 
 
 class UploadActionTests(unittest.TestCase):
+    upload = importlib.import_module("upload_zoho")
+
+    @classmethod
+    def setUpClass(cls):
+        # Shared read-only fixture; tests that add files use make_tmpdir().
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.sample_file = Path(cls.tmpdir.name) / "sample.txt"
+        cls.sample_file.write_text("content")
+        cls.creds = cls.upload.Credentials("client", "secret", "refresh", "folder")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
     def setUp(self):
-        self.tmpdir = tempfile.TemporaryDirectory()
-        self.addCleanup(self.tmpdir.cleanup)
-        self.sample_file = Path(self.tmpdir.name) / "sample.txt"
-        self.sample_file.write_text("content")
-
-        self._restore_env = {key: os.environ.get(key) for key in ENV_VARS}
-        for key, value in ENV_VARS.items():
-            os.environ[key] = value
-
-        if "upload_zoho" in sys.modules:
-            del sys.modules["upload_zoho"]
-        self.upload = importlib.import_module("upload_zoho")
-        # ensure module reads latest environment
-        self.upload = importlib.reload(self.upload)
-
-    def tearDown(self):
-        for key, old in self._restore_env.items():
-            if old is None:
-                os.environ.pop(key, None)
-            else:
-                os.environ[key] = old
+        env_patcher = mock.patch.dict(os.environ, ENV_VARS)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+        # The folder listing is cached for the run; start each test without it.
+        self.upload.list_folder_names.cache_clear()
+        self.addCleanup(self.upload.list_folder_names.cache_clear)
+
+    def make_tmpdir(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        return Path(tmpdir.name)
+
+    def patch_attrs(self, target, **attrs):
+        """Swap attributes on ``target`` for the duration of the test."""
+        for name, value in attrs.items():
+            self.addCleanup(setattr, target, name, getattr(target, name))
+            setattr(target, name, value)
 
     def test_conflict_abort_exits(self):
-        responses = [
+        responses = deque([
             FakeResponse(409, {"Error": "FILE_NAME_ALREADY_EXISTS"}, "conflict"),
-        ]
+        ])
 
         def fake_post(*args, **kwargs):
-            return responses.pop(0)
+            return responses.popleft()
 
-        with mock.patch.object(self.upload.requests, "post", side_effect=fake_post):
+        with mock.patch.object(self.upload.SESSION, "post", side_effect=fake_post):
             with self.assertRaises(SystemExit) as ctx:
                 self.upload.upload_file(
                     api_base="https://api",
-                    token="token",
+                    creds=self.creds,
                     path=str(self.sample_file),
                     remote_name="artifact.txt",
                     conflict_mode="abort",
@@ -86,30 +117,149 @@ class UploadActionTests(unittest.TestCase):
                 )
         self.assertIn("File already exists", str(ctx.exception))
 
+    def test_get_access_token_posts_refresh_grant(self):
+        os.environ["RUNNER_TEMP"] = str(self.make_tmpdir())
+        post_mock = mock.Mock(return_value=FakeResponse(200, {"access_token": "fresh"}))
+        self.patch_attrs(self.upload.SESSION, post=post_mock)
+        token = self.upload.get_access_token("https://accounts", self.creds)
+        self.assertEqual(token, "fresh")
+        args, kwargs = post_mock.call_args
+        self.assertEqual(args[0], "https://accounts/oauth/v2/token")
+        self.assertEqual(kwargs["data"]["refresh_token"], "refresh")
+        self.assertFalse(kwargs["allow_redirects"])
+
+    def test_get_access_token_exits_on_redirect(self):
+        os.environ["RUNNER_TEMP"] = str(self.make_tmpdir())
+        self.patch_attrs(self.upload.SESSION, post=mock.Mock(return_value=FakeResponse(302)))
+        with self.assertRaises(SystemExit) as ctx:
+            self.upload.get_access_token("https://accounts", self.creds)
+        self.assertIn("Token endpoint redirected: 302", str(ctx.exception))
+
+    def test_get_access_token_exits_on_non_json_body(self):
+        self.patch_attrs(self.upload.SESSION, post=mock.Mock(return_value=FakeResponse(200, None, "<html>oops</html>")))
+        with self.assertRaises(SystemExit) as ctx:
+            self.upload.get_access_token("https://accounts", self.creds)
+        self.assertIn("No access_token in refresh response: <html>oops</html>", str(ctx.exception))
+
+    def test_get_access_token_reuses_cached_token_until_expiry(self):
+        cache_dir = self.make_tmpdir()
+        os.environ["RUNNER_TEMP"] = str(cache_dir)
+        post_mock = mock.Mock(return_value=FakeResponse(200, {"access_token": "fresh", "expires_in": 3600}))
+        self.patch_attrs(self.upload.SESSION, post=post_mock)
+
+        self.assertEqual(self.upload.get_access_token("https://accounts", self.creds, use_cache=True), "fresh")
+        self.assertEqual(self.upload.get_access_token("https://accounts", self.creds, use_cache=True), "fresh")
+        self.assertEqual(post_mock.call_count, 1)
+
+        cache_path = Path(self.upload.token_cache_path("https://accounts", self.creds))
+        self.assertEqual(cache_path.parent, cache_dir)
+        self.assertEqual(cache_path.stat().st_mode & 0o777, 0o600)
+
+        # Another region or expiry forces a real refresh.
+        self.upload.get_access_token("https://accounts.eu", self.creds, use_cache=True)
+        self.assertEqual(post_mock.call_count, 2)
+        cache_path.write_text(json.dumps({"token": "stale", "exp": 0}))
+        self.assertEqual(self.upload.get_access_token("https://accounts", self.creds, use_cache=True), "fresh")
+        self.assertEqual(post_mock.call_count, 3)
+
+    def test_token_cache_is_opt_in_and_leaves_no_temp_files(self):
+        cache_dir = self.make_tmpdir()
+        os.environ["RUNNER_TEMP"] = str(cache_dir)
+        self.patch_attrs(self.upload.SESSION, post=mock.Mock(return_value=FakeResponse(200, {"access_token": "fresh"})))
+
+        self.upload.get_access_token("https://accounts", self.creds)
+        self.assertEqual(list(cache_dir.iterdir()), [])
+
+        with mock.patch.object(self.upload.os, "replace", side_effect=OSError("read-only")):
+            self.upload.get_access_token("https://accounts", self.creds, use_cache=True)
+        self.assertEqual(list(cache_dir.iterdir()), [])
+
+    def test_rejected_token_is_dropped_and_refreshed_once(self):
+        cache_dir = self.make_tmpdir()
+        os.environ["RUNNER_TEMP"] = str(cache_dir)
+        cache_path = Path(self.upload.token_cache_path("https://accounts", self.creds))
+        cache_path.write_text(json.dumps({"token": "revoked", "exp": 4102444800}))
+        sent = []
+
+        class FakeAdapter(requests.adapters.BaseAdapter):
+            def send(self, request, **kwargs):
+                sent.append((request.url, request.headers.get("Authorization")))
+                response = requests.Response()
+                response.request = request
+                response.url = request.url
+                if request.url.startswith("https://accounts"):
+                    response.status_code = 200
+                    response._content = b'{"access_token": "renewed"}'
+                elif request.headers.get("Authorization") == "Zoho-oauthtoken revoked":
+                    response.status_code = 401
+                    response._content = b"{}"
+                else:
+                    response.status_code = 200
+                    response._content = b'{"data": {"attributes": {"download_url": "https://d"}}}'
+                return response
+
+            def close(self):
+                pass
+
+        session = requests.Session()
+        session.mount("https://", FakeAdapter())
+        self.patch_attrs(self.upload, SESSION=session)
+        self.upload.authorize_session(self.upload.get_access_token("https://accounts", self.creds, use_cache=True))
+        self.upload.install_token_refresh("https://accounts", self.creds, use_cache=True)
+
+        self.assertEqual(self.upload.create_external_link("https://api", "res1", False), "https://d")
+        self.assertEqual(
+            sent,
+            [
+                ("https://api/links", "Zoho-oauthtoken revoked"),
+                ("https://accounts/oauth/v2/token", "Zoho-oauthtoken revoked"),
+                ("https://api/links", "Zoho-oauthtoken renewed"),
+            ],
+        )
+        self.assertEqual(self.upload.read_cached_token(str(cache_path)), "renewed")
+
+    def test_upload_missing_file_exits_without_request(self):
+        post_mock = mock.Mock(side_effect=AssertionError("no request expected"))
+        self.patch_attrs(self.upload.SESSION, post=post_mock)
+        for path in (os.path.join(self.tmpdir.name, "missing.txt"), self.tmpdir.name):
+            with self.assertRaises(SystemExit) as ctx:
+                self.upload.upload_file(
+                    api_base="https://api",
+                    creds=self.creds,
+                    path=path,
+                    remote_name="artifact.txt",
+                    conflict_mode="abort",
+                    max_retries=1,
+                    retry_delay=0,
+                    enable_logs=False,
+                )
+            self.assertIn("File not found", str(ctx.exception))
+
     def test_conflict_rename_generates_new_name(self):
         call_history = []
-        responses = [
+        responses = deque([
             FakeResponse(409, {"Error": "FILE_NAME_ALREADY_EXISTS"}, "conflict"),
             FakeResponse(
                 200,
                 {"data": [{"id": "res123", "attributes": {"Permalink": "https://p"}}]},
                 "",
             ),
-        ]
+        ])
 
-        def fake_post(url, headers=None, files=None, data=None, timeout=None, json=None):
+        def fake_post(url, data=None, headers=None, timeout=None, json=None):
+            fields = dict(data.fields)
             call_history.append(
-                {"filename": files["content"][0], "data": dict(data)}
+                {"filename": fields.pop("content")[0], "data": fields}
             )
-            return responses.pop(0)
+            return responses.popleft()
 
-        with mock.patch.object(self.upload.requests, "post", side_effect=fake_post):
+        with mock.patch.object(self.upload.SESSION, "post", side_effect=fake_post):
             with mock.patch.object(
                 self.upload, "generate_unique_name", return_value="artifact-renamed.txt"
             ):
                 resource_id, permalink, final_name = self.upload.upload_file(
                     api_base="https://api",
-                    token="token",
+                    creds=self.creds,
                     path=str(self.sample_file),
                     remote_name="artifact.txt",
                     conflict_mode="rename",
@@ -126,25 +276,26 @@ class UploadActionTests(unittest.TestCase):
 
     def test_conflict_replace_sets_override_flag(self):
         call_history = []
-        responses = [
+        responses = deque([
             FakeResponse(409, {"Error": "FILE_NAME_ALREADY_EXISTS"}, "conflict"),
             FakeResponse(
                 200,
                 {"data": [{"id": "res999", "attributes": {"Permalink": "https://p"}}]},
                 "",
             ),
-        ]
+        ])
 
-        def fake_post(url, headers=None, files=None, data=None, timeout=None, json=None):
+        def fake_post(url, data=None, headers=None, timeout=None, json=None):
+            fields = dict(data.fields)
             call_history.append(
-                {"filename": files["content"][0], "data": dict(data)}
+                {"filename": fields.pop("content")[0], "data": fields}
             )
-            return responses.pop(0)
+            return responses.popleft()
 
-        with mock.patch.object(self.upload.requests, "post", side_effect=fake_post):
+        with mock.patch.object(self.upload.SESSION, "post", side_effect=fake_post):
             res_id, permalink, final_name = self.upload.upload_file(
                 api_base="https://api",
-                token="token",
+                creds=self.creds,
                 path=str(self.sample_file),
                 remote_name="artifact.txt",
                 conflict_mode="replace",
@@ -159,26 +310,118 @@ class UploadActionTests(unittest.TestCase):
         self.assertNotIn("override-name-exist", call_history[0]["data"])
         self.assertEqual(call_history[1]["data"].get("override-name-exist"), "true")
 
+    def test_preflight_renames_before_upload(self):
+        call_history = []
+        listing = FakeResponse(200, {"data": [{"attributes": {"name": "artifact.txt"}}]})
+        get_mock = mock.Mock(return_value=listing)
+
+        def fake_post(url, data=None, headers=None, timeout=None, json=None):
+            call_history.append(dict(data.fields))
+            return FakeResponse(200, {"data": [{"id": "res1", "attributes": {}}]})
+
+        self.patch_attrs(self.upload, PREFLIGHT_MIN_BYTES=0)
+        self.patch_attrs(self.upload.SESSION, get=get_mock, post=fake_post)
+        self.patch_attrs(self.upload, generate_unique_name=lambda name, counter: f"artifact-{counter}.txt")
+        _, _, final_name = self.upload.upload_file(
+            api_base="https://api",
+            creds=self.creds,
+            path=str(self.sample_file),
+            remote_name="artifact.txt",
+            conflict_mode="rename",
+            max_retries=1,
+            retry_delay=0,
+            enable_logs=False,
+        )
+
+        self.assertEqual(final_name, "artifact-1.txt")
+        self.assertEqual(len(call_history), 1)
+        self.assertEqual(call_history[0]["content"][0], "artifact-1.txt")
+        self.assertEqual(get_mock.call_args[0][0], "https://api/files/folder/files")
+
+    def test_preflight_rename_exits_when_every_candidate_is_taken(self):
+        listing = {"data": [{"attributes": {"name": "artifact.txt"}}, {"attributes": {"name": "artifact-x.txt"}}]}
+        post_mock = mock.Mock(side_effect=AssertionError("no upload expected"))
+        self.patch_attrs(self.upload, PREFLIGHT_MIN_BYTES=0, generate_unique_name=lambda name, counter: "artifact-x.txt")
+        self.patch_attrs(self.upload.SESSION, get=mock.Mock(return_value=FakeResponse(200, listing)), post=post_mock)
+        with self.assertRaises(SystemExit) as ctx:
+            self.upload.upload_file(
+                api_base="https://api",
+                creds=self.creds,
+                path=str(self.sample_file),
+                remote_name="artifact.txt",
+                conflict_mode="rename",
+                max_retries=1,
+                retry_delay=0,
+                enable_logs=False,
+            )
+        self.assertIn("Too many rename attempts", str(ctx.exception))
+        post_mock.assert_not_called()
+
+    def test_folder_listing_reads_one_page_and_is_shared_across_uploads(self):
+        small_page = {"data": [{"attributes": {"name": "artifact.txt"}}]}
+        get_mock = mock.Mock(return_value=FakeResponse(200, small_page))
+        self.patch_attrs(self.upload.SESSION, get=get_mock)
+
+        names = self.upload.folder_names("https://api", "folder")
+        self.assertEqual(names, {"artifact.txt"})
+        self.assertIs(self.upload.folder_names("https://api", "folder"), names)
+        get_mock.assert_called_once()
+        self.assertEqual(get_mock.call_args.kwargs["params"], {"page[limit]": self.upload.FOLDER_PAGE_LIMIT})
+
+        # A full page may be partial, so the preflight is skipped rather than trusting it.
+        self.upload.list_folder_names.cache_clear()
+        full_page = {"data": [{"attributes": {"name": f"f{i}.txt"}} for i in range(self.upload.FOLDER_PAGE_LIMIT)]}
+        get_mock.return_value = FakeResponse(200, full_page)
+        self.assertIsNone(self.upload.folder_names("https://api", "folder"))
+        self.assertEqual(get_mock.call_count, 2)
+
+    def test_preflight_replace_sets_override_upfront_and_tolerates_errors(self):
+        fields_seen = []
+
+        def fake_post(url, data=None, headers=None, timeout=None, json=None):
+            fields_seen.append(dict(data.fields))
+            return FakeResponse(200, {"data": [{"id": "res1", "attributes": {}}]})
+
+        self.patch_attrs(self.upload, PREFLIGHT_MIN_BYTES=0)
+        self.patch_attrs(self.upload.SESSION, post=fake_post)
+        for listing, expected in (
+            (FakeResponse(200, {"data": [{"attributes": {"name": "artifact.txt"}}]}), "true"),
+            (FakeResponse(404, None, "not found"), None),
+        ):
+            self.upload.list_folder_names.cache_clear()
+            self.patch_attrs(self.upload.SESSION, get=mock.Mock(return_value=listing))
+            self.upload.upload_file(
+                api_base="https://api",
+                creds=self.creds,
+                path=str(self.sample_file),
+                remote_name="artifact.txt",
+                conflict_mode="replace",
+                max_retries=1,
+                retry_delay=0,
+                enable_logs=False,
+            )
+            self.assertEqual(fields_seen[-1].get("override-name-exist"), expected)
+
     def test_retry_on_server_error(self):
-        responses = [
+        responses = deque([
             FakeResponse(500, None, "server"),
             FakeResponse(
                 200,
                 {"data": [{"id": "res500", "attributes": {"Permalink": "https://p"}}]},
                 "",
             ),
-        ]
+        ])
         calls = []
 
-        def fake_post(url, headers=None, files=None, data=None, timeout=None, json=None):
-            calls.append(files["content"][0])
-            return responses.pop(0)
+        def fake_post(url, data=None, headers=None, timeout=None, json=None):
+            calls.append((data.fields["content"][0], data.to_string()))
+            return responses.popleft()
 
-        with mock.patch.object(self.upload.requests, "post", side_effect=fake_post):
+        with mock.patch.object(self.upload.SESSION, "post", side_effect=fake_post):
             with mock.patch.object(self.upload.time, "sleep", return_value=None) as sleeper:
                 res_id, _, _ = self.upload.upload_file(
                     api_base="https://api",
-                    token="token",
+                    creds=self.creds,
                     path=str(self.sample_file),
                     remote_name="artifact.txt",
                     conflict_mode="abort",
@@ -189,37 +432,356 @@ class UploadActionTests(unittest.TestCase):
 
         self.assertEqual(res_id, "res500")
         self.assertEqual(len(calls), 2)
+        # The single file handle is rewound, so every attempt carries the full body.
+        self.assertTrue(all(b"\r\n\r\ncontent\r\n" in body for _, body in calls))
         sleeper.assert_called_once()
+        self.assertLessEqual(0, sleeper.call_args[0][0])
+        self.assertLessEqual(sleeper.call_args[0][0], 0.01)
+
+    def test_upload_resends_once_after_token_rejection(self):
+        responses = deque([
+            FakeResponse(401, None, "invalid token"),
+            FakeResponse(200, {"data": [{"id": "res401", "attributes": {}}]}),
+            FakeResponse(401, None, "invalid token"),
+            FakeResponse(401, None, "invalid token"),
+        ])
+        self.patch_attrs(self.upload.SESSION, post=lambda *args, **kwargs: responses.popleft())
+        kwargs = dict(
+            api_base="https://api",
+            creds=self.creds,
+            path=str(self.sample_file),
+            remote_name="artifact.txt",
+            conflict_mode="abort",
+            max_retries=1,
+            retry_delay=0,
+            enable_logs=False,
+        )
+        self.assertEqual(self.upload.upload_file(**kwargs)[0], "res401")
+        with self.assertRaises(SystemExit) as ctx:
+            self.upload.upload_file(**kwargs)
+        self.assertIn("Upload failed: 401", str(ctx.exception))
+        self.assertFalse(responses)
+
+    def test_upload_exits_on_non_json_success_body(self):
+        self.patch_attrs(self.upload.SESSION, post=mock.Mock(return_value=FakeResponse(200, None, "<html>gateway</html>")))
+        with self.assertRaises(SystemExit) as ctx:
+            self.upload.upload_file(
+                api_base="https://api",
+                creds=self.creds,
+                path=str(self.sample_file),
+                remote_name="artifact.txt",
+                conflict_mode="abort",
+                max_retries=1,
+                retry_delay=0,
+                enable_logs=False,
+            )
+        self.assertIn("Unexpected upload response: <html>gateway</html>", str(ctx.exception))
+
+    def test_unexpected_upload_response_exits(self):
+        for payload in (
+            {"data": []},
+            {"data": [{"attributes": {}}]},
+            {"data": [{"attributes": "oops"}]},
+            {"data": "oops"},
+            ["data"],
+        ):
+            self.patch_attrs(self.upload.SESSION, post=mock.Mock(return_value=FakeResponse(200, payload)))
+            with self.assertRaises(SystemExit) as ctx:
+                self.upload.upload_file(
+                    api_base="https://api",
+                    creds=self.creds,
+                    path=str(self.sample_file),
+                    remote_name="artifact.txt",
+                    conflict_mode="abort",
+                    max_retries=1,
+                    retry_delay=0,
+                    enable_logs=False,
+                )
+            self.assertIn("Unexpected upload response", str(ctx.exception))
+
+    def test_auto_compress_gzips_text_and_remembers_rejection(self):
+        self.patch_attrs(self.upload, _GZIP_SUPPORT={})
+        responses = deque([
+            FakeResponse(400, None, "Invalid filename encoding"),
+            FakeResponse(415, None, "unsupported"),
+            FakeResponse(200, {"data": [{"id": "resgz", "attributes": {}}]}),
+            FakeResponse(200, {"data": [{"id": "resplain", "attributes": {}}]}),
+        ])
+        calls = []
+
+        def fake_post(url, data=None, headers=None, timeout=None, json=None):
+            raw = b"".join(data) if headers.get("Content-Encoding") else data.read()
+            calls.append((headers.get("Content-Encoding"), raw))
+            return responses.popleft()
+
+        kwargs = dict(
+            api_base="https://api",
+            creds=self.creds,
+            path=str(self.sample_file),
+            remote_name="artifact.txt",
+            conflict_mode="abort",
+            max_retries=1,
+            retry_delay=0,
+            enable_logs=False,
+            compress="auto",
+        )
+        with mock.patch.object(self.upload.SESSION, "post", side_effect=fake_post):
+            # Only a 415 counts as a gzip rejection, whatever a 400 body says.
+            with self.assertRaises(SystemExit) as ctx:
+                self.upload.upload_file(**kwargs)
+            self.assertIn("Upload failed: 400", str(ctx.exception))
+            self.assertNotIn("https://api", self.upload._GZIP_SUPPORT)
+            res_id, _, _ = self.upload.upload_file(**kwargs)
+            self.upload.upload_file(**kwargs)
+
+        self.assertEqual(res_id, "resgz")
+        self.assertEqual([encoding for encoding, _ in calls], ["gzip", "gzip", None, None])
+        # Each attempt gets a fresh multipart boundary, so compare the payloads by size.
+        self.assertEqual(len(gzip.decompress(calls[1][1])), len(calls[2][1]))
+        self.assertIn(b"\r\n\r\ncontent\r\n", calls[2][1])
+        self.assertIs(self.upload._GZIP_SUPPORT["https://api"], False)
+
+    def test_auto_compress_falls_back_for_every_concurrent_upload(self):
+        self.patch_attrs(self.upload, _GZIP_SUPPORT={})
+        # Both compressed uploads are in flight before either is rejected.
+        in_flight = threading.Barrier(2, timeout=5)
+        encodings = []
+
+        def fake_post(url, data=None, headers=None, timeout=None, json=None):
+            encodings.append(headers.get("Content-Encoding"))
+            if headers.get("Content-Encoding"):
+                in_flight.wait()
+                return FakeResponse(415, None, "unsupported")
+            return FakeResponse(200, {"data": [{"id": "res", "attributes": {}}]})
+
+        def upload():
+            return self.upload.upload_file(
+                api_base="https://api",
+                creds=self.creds,
+                path=str(self.sample_file),
+                remote_name="artifact.txt",
+                conflict_mode="abort",
+                max_retries=1,
+                retry_delay=0,
+                enable_logs=False,
+                compress="auto",
+            )
+
+        self.patch_attrs(self.upload.SESSION, post=fake_post)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = [future.result() for future in [executor.submit(upload) for _ in range(2)]]
+
+        self.assertEqual([res_id for res_id, _, _ in results], ["res", "res"])
+        self.assertEqual((encodings.count("gzip"), encodings.count(None)), (2, 2))
+
+    def test_rename_conflict_keeps_retry_budget(self):
+        responses = deque([
+            FakeResponse(500, None, "server"),
+            FakeResponse(409, {"Error": "FILE_NAME_ALREADY_EXISTS"}),
+            FakeResponse(500, None, "server"),
+        ])
+        self.patch_attrs(
+            self.upload.SESSION, post=lambda *args, **kwargs: responses.popleft()
+        )
+        with mock.patch.object(self.upload.time, "sleep", return_value=None):
+            with self.assertRaises(SystemExit) as ctx:
+                self.upload.upload_file(
+                    api_base="https://api",
+                    creds=self.creds,
+                    path=str(self.sample_file),
+                    remote_name="artifact.txt",
+                    conflict_mode="rename",
+                    max_retries=2,
+                    retry_delay=0,
+                    enable_logs=False,
+                )
+        # The rename did not hand out a fresh budget: the second 5xx is final.
+        self.assertIn("Upload failed: 500", str(ctx.exception))
+        self.assertFalse(responses)
+
+    def test_upload_retries_when_throttled(self):
+        responses = deque([
+            FakeResponse(429, None, "throttled"),
+            FakeResponse(200, {"data": [{"id": "res429", "attributes": {}}]}),
+        ])
+        self.patch_attrs(self.upload.SESSION, post=lambda *args, **kwargs: responses.popleft())
+        with mock.patch.object(self.upload.time, "sleep", return_value=None) as sleeper:
+            res_id, _, _ = self.upload.upload_file(
+                api_base="https://api",
+                creds=self.creds,
+                path=str(self.sample_file),
+                remote_name="artifact.txt",
+                conflict_mode="abort",
+                max_retries=2,
+                retry_delay=0,
+                enable_logs=False,
+            )
+        self.assertEqual(res_id, "res429")
+        sleeper.assert_called_once()
+
+    def test_backoff_delay_grows_exponentially_with_cap(self):
+        with mock.patch.object(self.upload._RANDOM, "uniform", side_effect=lambda low, high: high):
+            delays = [self.upload.backoff_delay(2, attempt, cap=10) for attempt in range(1, 5)]
+        self.assertEqual(delays, [2, 4, 8, 10])
+
+    def test_guess_content_type_memoises_by_extension(self):
+        self.assertEqual(self.upload.guess_content_type("logo.PNG"), "image/png")
+        self.assertEqual(self.upload.guess_content_type("bundle.tar.gz"), "application/x-tar")
+        self.assertEqual(self.upload.guess_content_type("blob.unknownext"), "application/octet-stream")
+        with mock.patch.object(self.upload.mimetypes, "guess_type") as guess_mock:
+            self.assertEqual(self.upload.guess_content_type("other.png"), "image/png")
+        guess_mock.assert_not_called()
+
+    def test_configure_retries_mounts_backoff_adapter(self):
+        session = requests.Session()
+        self.patch_attrs(self.upload, SESSION=session)
+        self.upload.configure_retries("https://api", max_retries=3, retry_delay=0.5)
+
+        api_adapter = session.get_adapter("https://api/links")
+        self.assertEqual(api_adapter.max_retries.total, 2)
+        self.assertEqual(api_adapter.max_retries.backoff_factor, 0.5)
+        self.assertIn(503, api_adapter.max_retries.status_forcelist)
+        self.assertIn(429, api_adapter.max_retries.status_forcelist)
+        self.assertTrue(api_adapter.max_retries.respect_retry_after_header)
+        self.assertIn("POST", api_adapter.max_retries.allowed_methods)
+        self.assertIn("GET", api_adapter.max_retries.allowed_methods)
+
+        # The first retry waits retry_delay, later ones double, and Retry-After is capped.
+        retry = api_adapter.max_retries.increment("POST", "https://api/links")
+        self.assertEqual(retry.get_backoff_time(), 0.5)
+        retry = retry.increment("POST", "https://api/links")
+        self.assertEqual(retry.get_backoff_time(), 1.0)
+        throttled = urllib3.response.HTTPResponse(status=429, headers={"Retry-After": "3600"})
+        self.assertEqual(retry.get_retry_after(throttled), self.upload.RETRY_BACKOFF_MAX)
+
+        upload_adapter = session.get_adapter("https://api/upload")
+        self.assertEqual(upload_adapter.max_retries.total, 0)
+        self.assertIs(upload_adapter.poolmanager, api_adapter.poolmanager)
+
+    def test_public_folder_skips_share_call(self):
+        self.upload._folder_grants_public_view.cache_clear()
+        self.addCleanup(self.upload._folder_grants_public_view.cache_clear)
+        permissions = {"data": [{"attributes": {"shared_type": "everyone", "role_id": "34"}}]}
+        get_mock = mock.Mock(return_value=FakeResponse(200, permissions))
+        share_mock = mock.Mock()
+        self.patch_attrs(self.upload.SESSION, get=get_mock)
+        self.patch_attrs(self.upload, share_everyone_view=share_mock)
+
+        for resource_id in ("res1", "res2"):
+            self.upload.ensure_public_view("https://api", "folder", resource_id, False)
+
+        share_mock.assert_not_called()
+        get_mock.assert_called_once()
+        self.assertEqual(get_mock.call_args[0][0], "https://api/files/folder/permissions")
+
+        # Another role, a private folder or a failed lookup falls back to sharing each file.
+        for response in (
+            FakeResponse(200, {"data": [{"attributes": {"shared_type": "everyone", "role_id": "6"}}]}),
+            FakeResponse(403, None, "forbidden"),
+        ):
+            self.upload._folder_grants_public_view.cache_clear()
+            get_mock.return_value = response
+            share_mock.reset_mock()
+            self.upload.ensure_public_view("https://api", "folder", "res3", False)
+            share_mock.assert_called_once_with("https://api", "res3", False)
+
+    def test_create_external_link_rejects_unexpected_payload(self):
+        post_mock = mock.Mock(return_value=FakeResponse(200, {"data": []}))
+        self.patch_attrs(self.upload.SESSION, post=post_mock)
+        with self.assertRaises(SystemExit) as ctx:
+            self.upload.create_external_link("https://api", "res1", enable_logs=False)
+        self.assertIn("Unexpected link response", str(ctx.exception))
+
+    def test_compose_links_builds_requested_variants_only(self):
+        base = "https://files.example.com/abc/download"
+        self.assertEqual(
+            self.upload.compose_links(base, "direct"),
+            {"direct": f"{base}?directDownload=true"},
+        )
+        self.assertEqual(
+            self.upload.compose_links(base, "preview"),
+            {"preview": "https://files.example.com/abc/preview"},
+        )
+        self.assertEqual(
+            self.upload.compose_links(f"{base}?x=1", "both"),
+            {
+                "direct": f"{base}?x=1&directDownload=true",
+                "preview": "https://files.example.com/abc/preview?x=1",
+            },
+        )
+
+    def test_log_line_formats_only_when_enabled(self):
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            # A mismatched template would raise if it were interpolated.
+            self.upload.log_line("⏳ Uploading '%s' (attempt %d)", "", False, "a.txt")
+            self.upload.log_line("⏳ Uploading '%s' (attempt %d/%d)", "", True, "a.txt", 2, 3)
+        self.assertIn("⏳ Uploading 'a.txt' (attempt 2/3)", stdout.getvalue())
+        self.assertEqual(stdout.getvalue().count("Uploading"), 1)
+
+    def test_output_full_plain_summary(self):
+        result = self.upload.UploadResult(
+            source_path="a.txt",
+            resource_id="res1",
+            remote_name="a.txt",
+            links={"direct": "https://d", "preview": "https://p"},
+            html_snippet=None,
+            permalink=None,
+        )
+        buffer = io.StringIO()
+        with mock.patch("sys.stdout", buffer):
+            self.upload.output_full(
+                results=[result],
+                region="eu",
+                share_mode="public",
+                link_mode="both",
+                api_base="https://api",
+                enable_color=False,
+            )
+        self.assertEqual(
+            buffer.getvalue(),
+            "✅ Upload complete — res1\n\n📄 Remote filename: a.txt\n\n⚡ Direct download: https://d\n"
+            "\n🖥️  WorkDrive share: https://p\n"
+            "\nℹ️  Context: region=EU · share_mode=public · link_mode=both · api_base=https://api\n",
+        )
 
     def test_main_share_skip_uses_internal_link(self):
         internal_link = "https://workdrive.zoho.com/file/internal123"
-        with mock.patch.object(
-            self.upload, "get_access_token", return_value="token"
-        ), mock.patch.object(
-            self.upload, "upload_file", return_value=("resABC", internal_link, "doc.txt")
-        ), mock.patch.object(self.upload, "share_everyone_view") as share_mock, mock.patch.object(
-            self.upload, "create_external_link"
-        ) as link_mock, mock.patch.object(
-            self.upload, "log_line", return_value=None
-        ):
-            share_mock.side_effect = AssertionError("share should not be called")
-            link_mock.side_effect = AssertionError("link should not be created")
-            argv = [
-                "upload_zoho.py",
-                str(self.sample_file),
-                "--share-mode=skip",
-                "--link-mode=preview",
-                "--stdout-mode=json",
-            ]
-            with mock.patch.object(sys, "argv", argv):
-                buffer = io.StringIO()
-                with mock.patch("sys.stdout", buffer):
-                    self.upload.main()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("share/link should not be called")
+
+        session = requests.Session()
+        self.patch_attrs(
+            self.upload,
+            SESSION=session,
+            get_access_token=lambda *args: "token",
+            install_token_refresh=lambda *args: None,
+            upload_file=lambda **kwargs: ("resABC", internal_link, "doc.txt"),
+            share_everyone_view=fail,
+            create_external_link=fail,
+            log_line=lambda *args, **kwargs: None,
+        )
+        argv = [
+            "upload_zoho.py",
+            str(self.sample_file),
+            "--share-mode=skip",
+            "--link-mode=preview",
+            "--stdout-mode=json",
+        ]
+        with mock.patch.object(sys, "argv", argv):
+            buffer = io.StringIO()
+            with mock.patch("sys.stdout", buffer):
+                self.upload.main()
 
         payload = json.loads(buffer.getvalue())
         self.assertIsNone(payload.get("direct_url"))
         self.assertEqual(payload.get("preview_url"), internal_link)
         self.assertEqual(payload.get("resource_id"), "resABC")
+        self.assertEqual(session.headers["Authorization"], "Zoho-oauthtoken token")
+        self.assertIsInstance(session.get_adapter("https://www.zohoapis.com/workdrive/api/v1/links").max_retries, self.upload.BackoffRetry)
+
+    def test_session_identifies_the_action(self):
+        self.assertTrue(self.upload.SESSION.headers["User-Agent"].startswith("zoho-upload-action "))
 
     def test_resolve_file_path_returns_absolute(self):
         resolved = self.upload.resolve_file_path(str(self.sample_file))
@@ -245,45 +807,48 @@ class UploadActionTests(unittest.TestCase):
         self.assertIn("File not found in workspace", message)
 
     def test_main_multiple_files_json_outputs_all_results(self):
-        second_file = Path(self.tmpdir.name) / "sample2.txt"
+        workdir = self.make_tmpdir()
+        second_file = workdir / "sample2.txt"
         second_file.write_text("more content")
 
-        output_file = Path(self.tmpdir.name) / "outputs.txt"
+        output_file = workdir / "outputs.txt"
         os.environ["GITHUB_OUTPUT"] = str(output_file)
         self.addCleanup(os.environ.pop, "GITHUB_OUTPUT", None)
 
-        upload_side_effects = [
-            ("resA", "https://permalinkA", "artifact-a.txt"),
-            ("resB", "https://permalinkB", "artifact-b.txt"),
-        ]
+        # Files are processed concurrently, so key the fakes on their inputs.
+        uploads = {
+            str(self.sample_file): ("resA", "https://permalinkA", "artifact-a.txt"),
+            str(second_file): ("resB", "https://permalinkB", "artifact-b.txt"),
+        }
+        links = {
+            "resA": "https://files.example.com/a/download",
+            "resB": "https://files.example.com/b/download",
+        }
 
-        link_side_effects = [
-            "https://files.example.com/a/download",
-            "https://files.example.com/b/download",
+        upload_mock = mock.Mock(side_effect=lambda **kwargs: uploads[kwargs["path"]])
+        share_mock = mock.Mock()
+        self.patch_attrs(
+            self.upload,
+            SESSION=requests.Session(),
+            get_access_token=lambda *args: "token",
+            install_token_refresh=lambda *args: None,
+            upload_file=upload_mock,
+            folder_shared_publicly=lambda *args: False,
+            share_everyone_view=share_mock,
+            create_external_link=lambda api_base, resource_id, enable_logs: links[resource_id],
+            log_line=lambda *args, **kwargs: None,
+        )
+        argv = [
+            "upload_zoho.py",
+            str(self.sample_file),
+            str(second_file),
+            "--stdout-mode=json",
+            "--link-mode=both",
         ]
-
-        with mock.patch.object(
-            self.upload, "get_access_token", return_value="token"
-        ), mock.patch.object(
-            self.upload, "upload_file", side_effect=upload_side_effects
-        ) as upload_mock, mock.patch.object(
-            self.upload, "share_everyone_view"
-        ) as share_mock, mock.patch.object(
-            self.upload, "create_external_link", side_effect=link_side_effects
-        ), mock.patch.object(
-            self.upload, "log_line", return_value=None
-        ):
-            argv = [
-                "upload_zoho.py",
-                str(self.sample_file),
-                str(second_file),
-                "--stdout-mode=json",
-                "--link-mode=both",
-            ]
-            with mock.patch.object(sys, "argv", argv):
-                buffer = io.StringIO()
-                with mock.patch("sys.stdout", buffer):
-                    self.upload.main()
+        with mock.patch.object(sys, "argv", argv):
+            buffer = io.StringIO()
+            with mock.patch("sys.stdout", buffer):
+                self.upload.main()
 
         payload = json.loads(buffer.getvalue())
         self.assertIsInstance(payload, list)
@@ -302,104 +867,125 @@ class UploadActionTests(unittest.TestCase):
         self.assertEqual(share_mock.call_count, 2)
 
     def test_remote_name_multiple_files_exits(self):
-        second_file = Path(self.tmpdir.name) / "sample2.txt"
+        second_file = self.make_tmpdir() / "sample2.txt"
         second_file.write_text("more content")
 
-        with mock.patch.object(
-            self.upload, "get_access_token", return_value="token"
-        ), mock.patch.object(
-            self.upload, "log_line", return_value=None
-        ):
-            argv = [
-                "upload_zoho.py",
-                str(self.sample_file),
-                str(second_file),
-                "--remote-name=custom.bin",
-            ]
-            with mock.patch.object(sys, "argv", argv):
-                with self.assertRaises(SystemExit) as ctx:
-                    self.upload.main()
+        self.patch_attrs(
+            self.upload,
+            SESSION=requests.Session(),
+            get_access_token=lambda *args: "token",
+            install_token_refresh=lambda *args: None,
+            log_line=lambda *args, **kwargs: None,
+        )
+        argv = [
+            "upload_zoho.py",
+            str(self.sample_file),
+            str(second_file),
+            "--remote-name=custom.bin",
+        ]
+        with mock.patch.object(sys, "argv", argv):
+            with self.assertRaises(SystemExit) as ctx:
+                self.upload.main()
 
         self.assertIn("--remote-name", str(ctx.exception))
 
     def test_glob_pattern_expands_multiple_files(self):
-        png_one = Path(self.tmpdir.name) / "image1.png"
-        png_two = Path(self.tmpdir.name) / "image2.png"
+        workdir = self.make_tmpdir()
+        png_one = workdir / "image1.png"
+        png_two = workdir / "image2.png"
         png_one.write_bytes(b"one")
         png_two.write_bytes(b"two")
 
-        with mock.patch.object(
-            self.upload, "get_access_token", return_value="token"
-        ), mock.patch.object(
-            self.upload, "upload_file",
-            side_effect=[
-                ("res1", "https://permalink1", "image1.png"),
-                ("res2", "https://permalink2", "image2.png"),
-            ],
-        ) as upload_mock, mock.patch.object(
-            self.upload, "share_everyone_view"
-        ) as share_mock, mock.patch.object(
-            self.upload, "create_external_link",
-            side_effect=[
-                "https://files.example.com/1/download",
-                "https://files.example.com/2/download",
-            ],
-        ), mock.patch.object(
-            self.upload, "log_line", return_value=None
-        ):
-            argv = [
-                "upload_zoho.py",
-                str(Path(self.tmpdir.name) / "*.png"),
-                "--stdout-mode=json",
-            ]
-            with mock.patch.object(sys, "argv", argv):
-                buffer = io.StringIO()
-                with mock.patch("sys.stdout", buffer):
-                    self.upload.main()
+        uploads = {
+            str(png_one): ("res1", "https://permalink1", "image1.png"),
+            str(png_two): ("res2", "https://permalink2", "image2.png"),
+        }
+        upload_mock = mock.Mock(side_effect=lambda **kwargs: uploads[kwargs["path"]])
+        self.patch_attrs(
+            self.upload,
+            SESSION=requests.Session(),
+            get_access_token=lambda *args: "token",
+            install_token_refresh=lambda *args: None,
+            upload_file=upload_mock,
+            folder_shared_publicly=lambda *args: False,
+            share_everyone_view=lambda *args: None,
+            create_external_link=lambda api_base, resource_id, enable_logs: (
+                f"https://files.example.com/{resource_id}/download"
+            ),
+            log_line=lambda *args, **kwargs: None,
+        )
+        argv = [
+            "upload_zoho.py",
+            str(workdir / "*.png"),
+            "--stdout-mode=json",
+        ]
+        with mock.patch.object(sys, "argv", argv):
+            buffer = io.StringIO()
+            with mock.patch("sys.stdout", buffer):
+                self.upload.main()
 
         self.assertEqual(upload_mock.call_count, 2)
+        payload = json.loads(buffer.getvalue())
+        self.assertEqual([item["resource_id"] for item in payload], ["res1", "res2"])
 
     def test_expand_input_paths_splits_commas(self):
-        second_file = Path(self.tmpdir.name) / "sample2.txt"
+        second_file = self.make_tmpdir() / "sample2.txt"
         second_file.write_text("more content")
 
         combined = f" {self.sample_file} , {second_file} "
         expanded = self.upload.expand_input_paths([combined])
         self.assertEqual(expanded, [str(self.sample_file), str(second_file)])
 
+    def test_expand_input_paths_skips_resolve_for_glob_matches(self):
+        resolve_mock = mock.Mock(side_effect=AssertionError("glob matches are already resolved"))
+        self.patch_attrs(self.upload, resolve_file_path=resolve_mock)
+        expanded = self.upload.expand_input_paths([str(Path(self.tmpdir.name) / "*.txt")])
+        self.assertEqual(expanded, [os.path.abspath(self.sample_file)])
+
+    def test_expand_input_paths_dedupes_overlapping_entries(self):
+        workdir = self.make_tmpdir()
+        second_file = workdir / "sample2.txt"
+        second_file.write_text("more content")
+
+        pattern = str(workdir / "*.txt")
+        expanded = self.upload.expand_input_paths(
+            [str(second_file), pattern, f"{self.sample_file},{self.sample_file}"]
+        )
+        self.assertEqual(expanded, [str(second_file), str(self.sample_file)])
+
     def test_main_accepts_comma_delimited_files(self):
-        second_file = Path(self.tmpdir.name) / "second.txt"
+        second_file = self.make_tmpdir() / "second.txt"
         second_file.write_text("two")
 
-        upload_side_effects = [
-            ("resA", "https://permalinkA", "artifact-a.txt"),
-            ("resB", "https://permalinkB", "artifact-b.txt"),
-        ]
-        link_side_effects = [
-            "https://files.example.com/a/download",
-            "https://files.example.com/b/download",
-        ]
+        uploads = {
+            str(self.sample_file): ("resA", "https://permalinkA", "artifact-a.txt"),
+            str(second_file): ("resB", "https://permalinkB", "artifact-b.txt"),
+        }
 
-        with mock.patch.object(
-            self.upload, "get_access_token", return_value="token"
-        ), mock.patch.object(
-            self.upload, "upload_file", side_effect=upload_side_effects
-        ) as upload_mock, mock.patch.object(
-            self.upload, "share_everyone_view"
-        ) as share_mock, mock.patch.object(
-            self.upload, "create_external_link", side_effect=link_side_effects
-        ), mock.patch.object(
-            self.upload, "log_line", return_value=None
-        ):
-            argv = [
-                "upload_zoho.py",
-                f"{self.sample_file},{second_file}",
-                "--stdout-mode=json",
-            ]
-            with mock.patch.object(sys, "argv", argv):
-                buffer = io.StringIO()
-                with mock.patch("sys.stdout", buffer):
-                    self.upload.main()
+        upload_mock = mock.Mock(side_effect=lambda **kwargs: uploads[kwargs["path"]])
+        share_mock = mock.Mock()
+        self.patch_attrs(
+            self.upload,
+            SESSION=requests.Session(),
+            get_access_token=lambda *args: "token",
+            install_token_refresh=lambda *args: None,
+            upload_file=upload_mock,
+            folder_shared_publicly=lambda *args: False,
+            share_everyone_view=share_mock,
+            create_external_link=lambda api_base, resource_id, enable_logs: (
+                f"https://files.example.com/{resource_id}/download"
+            ),
+            log_line=lambda *args, **kwargs: None,
+        )
+        argv = [
+            "upload_zoho.py",
+            f"{self.sample_file},{second_file}",
+            "--stdout-mode=json",
+        ]
+        with mock.patch.object(sys, "argv", argv):
+            buffer = io.StringIO()
+            with mock.patch("sys.stdout", buffer):
+                self.upload.main()
 
         payload = json.loads(buffer.getvalue())
         self.assertIsInstance(payload, list)
@@ -407,6 +993,47 @@ class UploadActionTests(unittest.TestCase):
         self.assertEqual(upload_mock.call_count, 2)
         self.assertEqual(share_mock.call_count, 2)
 
+    def test_dumps_json_is_compact_utf8(self):
+        payload = [{"remote_name": "résumé.pdf", "html": None}]
+        self.assertEqual(self.upload.dumps_json(payload), '[{"remote_name":"résumé.pdf","html":null}]')
+
+    def test_append_outputs_appends_utf8_lines(self):
+        output_file = self.make_tmpdir() / "outputs.txt"
+        output_file.write_text("existing=1\n")
+        self.upload.append_outputs(str(output_file), {"zoho_remote_name": "résumé.pdf", "zoho_resource_id": "res1"})
+        self.assertEqual(
+            output_file.read_text(encoding="utf-8"),
+            "existing=1\nzoho_remote_name=résumé.pdf\nzoho_resource_id=res1\n",
+        )
+
+    def test_resolve_endpoints_applies_normalised_overrides(self):
+        self.assertEqual(
+            self.upload.resolve_endpoints("EU"),
+            ("eu", "https://www.zohoapis.eu/workdrive/api/v1", "https://accounts.zoho.eu"),
+        )
+        region, api_base, accounts_base = self.upload.resolve_endpoints(
+            "nowhere", api_base_override="https://proxy.example.com/workdrive/"
+        )
+        self.assertEqual(region, "nowhere")
+        self.assertEqual(api_base, "https://proxy.example.com/workdrive")
+        self.assertEqual(accounts_base, "https://accounts.zoho.com")
+
+    def test_load_credentials_reports_every_missing_env_var(self):
+        self.assertEqual(self.upload.load_credentials(), self.creds)
+        os.environ.pop("ZOHO_FOLDER_ID")
+        os.environ["ZOHO_CLIENT_SECRET"] = ""
+        with self.assertRaises(SystemExit) as ctx:
+            self.upload.load_credentials()
+        self.assertIn("ZOHO_CLIENT_SECRET, ZOHO_FOLDER_ID", str(ctx.exception))
+        self.assertNotIn("ZOHO_CLIENT_ID", str(ctx.exception))
+
+    def test_max_concurrency_out_of_range_exits(self):
+        argv = ["upload_zoho.py", str(self.sample_file), "--max-concurrency=0"]
+        with mock.patch.object(sys, "argv", argv):
+            with self.assertRaises(SystemExit) as ctx:
+                self.upload.main()
+        self.assertIn("--max-concurrency", str(ctx.exception))
+
     def test_glob_pattern_without_matches_exits(self):
         argv = [
             "upload_zoho.py",
@@ -16,17 +16,42 @@ Environment requirements
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import json
 import mimetypes
 import os
+import random
 import sys
+import tempfile
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 import requests
-from glob import glob, has_magic
+from glob import has_magic, iglob
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
+
+try:  # Optional: orjson is faster; both paths emit the same compact UTF-8 JSON.
+    import orjson
+
+    def dumps_json(payload: object) -> str:
+        return orjson.dumps(payload).decode("utf-8")
+
+    loads_json = orjson.loads  # JSONDecodeError subclasses ValueError
+
+except ImportError:  # pragma: no cover - depends on the runner environment
+
+    def dumps_json(payload: object) -> str:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+    loads_json = json.loads
 
 # Terminal styling (GitHub Actions understands ANSI escapes).
 RESET = "\033[0m"
@@ -38,6 +63,19 @@ MAGENTA = "\033[35m"
 YELLOW = "\033[33m"
 RED = "\033[31m"
 
+# Static labels for the full summary, styled once at import.
+PLAIN_LABELS: Dict[str, str] = {
+    "remote": "📄 Remote filename",
+    "direct": "⚡ Direct download",
+    "preview": "🖥️  WorkDrive share",
+    "html": "🧩 HTML embed",
+    "context": "ℹ️  Context",
+}
+_LABEL_STYLES = {"remote": CYAN, "direct": CYAN, "preview": BLUE, "html": MAGENTA, "context": YELLOW}
+STYLED_LABELS: Dict[str, str] = {
+    key: f"{_LABEL_STYLES[key]}{text}{RESET}" for key, text in PLAIN_LABELS.items()
+}
+
 REGION_ENDPOINTS: Dict[str, Tuple[str, str]] = {
     "us": ("https://www.zohoapis.com/workdrive/api/v1", "https://accounts.zoho.com"),
     "eu": ("https://www.zohoapis.eu/workdrive/api/v1", "https://accounts.zoho.eu"),
@@ -48,10 +86,63 @@ REGION_ENDPOINTS: Dict[str, Tuple[str, str]] = {
 }
 DEFAULT_REGION = "us"
 
-CLIENT_ID = os.getenv("ZOHO_CLIENT_ID")
-CLIENT_SECRET = os.getenv("ZOHO_CLIENT_SECRET")
-REFRESH_TOKEN = os.getenv("ZOHO_REFRESH_TOKEN")
-FOLDER_ID = os.getenv("ZOHO_FOLDER_ID")
+CREDENTIAL_ENV_VARS: Dict[str, str] = {
+    "client_id": "ZOHO_CLIENT_ID",
+    "client_secret": "ZOHO_CLIENT_SECRET",
+    "refresh_token": "ZOHO_REFRESH_TOKEN",
+    "folder_id": "ZOHO_FOLDER_ID",
+}
+
+# One pooled session for every Zoho call so the token, upload, share and link
+# requests reuse keep-alive TCP/TLS connections instead of handshaking each time.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+SESSION.headers["Connection"] = "keep-alive"
+SESSION.headers["User-Agent"] = f"zoho-upload-action {requests.utils.default_user_agent()}"
+
+# Load the system MIME tables once up front; lookups are memoised per extension.
+mimetypes.init()
+_CONTENT_TYPES: Dict[str, str] = {}
+
+# Throttling and transient gateway errors worth retrying on every API call.
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+# Upper bound in seconds for any single retry wait, including server Retry-After hints.
+RETRY_BACKOFF_MAX = 30.0
+_RANDOM = random.SystemRandom()
+
+# Types worth gzipping under --compress auto; already-compressed media and
+# archives are sent as-is.
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml", "image/svg")
+# Whether each API base accepted a gzip upload this run; a rejection disables
+# compression for the remaining auto-mode uploads.
+_GZIP_SUPPORT: Dict[str, bool] = {}
+
+# Files at least this large get a folder listing before upload so name
+# conflicts are settled without sending the body twice.
+PREFLIGHT_MIN_BYTES = 1024 * 1024
+# The preflight reads a single listing page; larger folders skip it and rely on
+# the 409 handling alone.
+FOLDER_PAGE_LIMIT = 50
+_FOLDER_NAMES_LOCK = threading.Lock()
+
+# Files uploaded in parallel for multi-file runs (--max-concurrency). Each file
+# may also hold a share and a link request in flight, so the connection pool is
+# sized to twice the concurrency.
+DEFAULT_MAX_CONCURRENCY = 4
+MAX_CONCURRENCY_LIMIT = 16
+# Threads are only spawned on demand; one share call per in-flight file.
+_SHARE_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY_LIMIT, thread_name_prefix="zoho-share")
+
+# Role granted by share_everyone_view ("View"). A folder's everyone share only
+# counts as covering new files when it grants this same role; other role ids are
+# not assumed to include view access.
+PUBLIC_VIEW_ROLE = "34"
+_FOLDER_PERMISSIONS_LOCK = threading.Lock()
+
+JSONAPI_HEADERS = {
+    "Accept": "application/vnd.api+json",
+    "Content-Type": "application/json",
+}
 
 
 def is_within(path: str, parent: str) -> bool:
@@ -94,21 +185,31 @@ def _split_raw_entries(raw: str) -> List[str]:
 
 
 def expand_input_paths(raw_paths: Sequence[str]) -> List[str]:
+    """Expand comma lists and glob patterns into absolute paths of existing files.
+
+    Paths are returned in input order; a file matched by several entries is only kept once.
+    """
     expanded: List[str] = []
+    seen: Set[str] = set()
     for raw in raw_paths:
         for entry in _split_raw_entries(raw):
             candidate = os.path.expanduser(entry)
             if has_magic(candidate):
-                matches = [
-                    path
-                    for path in glob(candidate, recursive=True)
+                # iglob() only yields existing entries and we already filtered on
+                # isfile, so skip resolve_file_path()'s extra stat per match.
+                matches = sorted(
+                    os.path.abspath(path)
+                    for path in iglob(candidate, recursive=True)
                     if os.path.isfile(path)
-                ]
+                )
                 if not matches:
                     sys.exit(color(f"❌ No files matched pattern: {entry}", RED, True))
-                expanded.extend(sorted(matches))
             else:
-                expanded.append(candidate)
+                matches = [resolve_file_path(candidate)]
+            for path in matches:
+                if path not in seen:
+                    seen.add(path)
+                    expanded.append(path)
     return expanded
 
 
@@ -116,38 +217,107 @@ def color(text: str, ansi: str, enable: bool) -> str:
     return f"{ansi}{text}{RESET}" if enable else text
 
 
-def log_line(message: str, ansi: str, enable: bool) -> None:
+def log_line(message: str, ansi: str, enable: bool, *args: object) -> None:
+    """Print a colored log line; ``%`` arguments are only interpolated when logging is on."""
     if enable:
-        print(color(message, ansi, True))
+        print(color(message % args if args else message, ansi, True))
 
 
-def need(*names: str) -> None:
-    missing = [n for n in names if not globals()[n]]
+@dataclass(frozen=True, slots=True)
+class Credentials:
+    client_id: str
+    client_secret: str
+    refresh_token: str
+    folder_id: str
+
+
+def load_credentials() -> Credentials:
+    """Read the OAuth credentials and target folder once, reporting every missing variable."""
+    values = {field: os.getenv(env, "") for field, env in CREDENTIAL_ENV_VARS.items()}
+    missing = [env for field, env in CREDENTIAL_ENV_VARS.items() if not values[field]]
     if missing:
         sys.exit(color("❌ Missing env vars: " + ", ".join(missing), RED, True))
+    return Credentials(**values)
 
 
-def resolve_endpoints(region: str) -> Tuple[str, str, str]:
+def resolve_endpoints(
+    region: str,
+    api_base_override: Optional[str] = None,
+    accounts_base_override: Optional[str] = None,
+) -> Tuple[str, str, str]:
     region = region.lower()
-    endpoint = REGION_ENDPOINTS.get(region, REGION_ENDPOINTS[DEFAULT_REGION])
-    api_override = os.getenv("ZOHO_API_BASE")
-    accounts_override = os.getenv("ZOHO_ACCOUNTS_BASE")
-    api_base = (api_override or endpoint[0]).rstrip("/")
-    accounts_base = (accounts_override or endpoint[1]).rstrip("/")
+    # REGION_ENDPOINTS entries carry no trailing slash; normalise overrides to match.
+    api_base, accounts_base = REGION_ENDPOINTS.get(region, REGION_ENDPOINTS[DEFAULT_REGION])
+    api_base = (api_base_override or "").rstrip("/") or api_base
+    accounts_base = (accounts_base_override or "").rstrip("/") or accounts_base
     return region, api_base, accounts_base
 
 
-def get_access_token(accounts_base: str) -> str:
-    response = requests.post(
+def token_cache_path(accounts_base: str, creds: Credentials) -> str:
+    identity = f"{accounts_base}\0{creds.client_id}\0{creds.refresh_token}"
+    key = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+    cache_dir = os.getenv("RUNNER_TEMP") or tempfile.gettempdir()
+    return os.path.join(cache_dir, f".zoho_token_{key}.json")
+
+
+def read_cached_token(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            cached = json.load(handle)
+        if cached["exp"] > time.time():
+            return cached["token"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def write_cached_token(path: str, token: str, expires_in: float) -> None:
+    # Refresh a minute early so a token never expires mid-run.
+    payload = json.dumps({"token": token, "exp": time.time() + expires_in - 60})
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".zoho_token_")  # mode 0600
+    except OSError:
+        return  # caching is best-effort
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def drop_cached_token(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def get_access_token(accounts_base: str, creds: Credentials, use_cache: bool = False) -> str:
+    """Return an access token; with ``use_cache``, reuse one cached by an earlier step of this job."""
+    cache_path = token_cache_path(accounts_base, creds) if use_cache else None
+    if cache_path:
+        cached = read_cached_token(cache_path)
+        if cached:
+            return cached
+
+    response = SESSION.post(
         f"{accounts_base}/oauth/v2/token",
         data={
-            "refresh_token": REFRESH_TOKEN,
-            "client_id": CLIENT_ID,
-            "client_secret": CLIENT_SECRET,
+            "refresh_token": creds.refresh_token,
+            "client_id": creds.client_id,
+            "client_secret": creds.client_secret,
             "grant_type": "refresh_token",
         },
+        # The token endpoint answers directly; never replay credentials elsewhere.
+        allow_redirects=False,
         timeout=20,
     )
+    if 300 <= response.status_code < 400:
+        sys.exit(color(f"❌ Token endpoint redirected: {response.status_code}; check ZOHO_ACCOUNTS_BASE.", RED, True))
     try:
         response.raise_for_status()
     except requests.HTTPError:
@@ -158,14 +328,109 @@ def get_access_token(accounts_base: str) -> str:
                 True,
             )
         )
-    token = response.json().get("access_token")
+    try:
+        payload = loads_json(response.content)
+    except ValueError:
+        payload = None
+    token = payload.get("access_token") if isinstance(payload, dict) else None
     if not token:
         sys.exit(color(f"❌ No access_token in refresh response: {response.text}", RED, True))
+    if cache_path:
+        try:
+            expires_in = float(payload.get("expires_in", 3600))
+        except (TypeError, ValueError):
+            expires_in = 3600.0
+        write_cached_token(cache_path, token, expires_in)
     return token
 
 
-def auth_header(token: str) -> Dict[str, str]:
-    return {"Authorization": f"Zoho-oauthtoken {token}"}
+def install_token_refresh(accounts_base: str, creds: Credentials, use_cache: bool) -> None:
+    """Refresh the access token once if Zoho rejects it, e.g. a cached token that was revoked.
+
+    Requests with a replayable body are re-sent with the new token; streamed uploads
+    are retried by ``upload_file`` itself.
+    """
+    lock = threading.Lock()
+    refreshed = threading.Event()
+
+    def refresh_on_unauthorized(response: requests.Response, *args, **kwargs) -> requests.Response:
+        if response.status_code != 401 or response.request.url.startswith(accounts_base):
+            return response
+        with lock:
+            if not refreshed.is_set():
+                refreshed.set()
+                if use_cache:
+                    drop_cached_token(token_cache_path(accounts_base, creds))
+                authorize_session(get_access_token(accounts_base, creds, use_cache))
+        current = SESSION.headers["Authorization"]
+        body = response.request.body
+        if response.request.headers.get("Authorization") == current or not isinstance(body, (bytes, str, type(None))):
+            return response
+        retry = response.request.copy()
+        retry.headers["Authorization"] = current
+        return SESSION.send(retry, **kwargs)
+
+    SESSION.hooks["response"] = [refresh_on_unauthorized]
+
+
+class BackoffRetry(Retry):
+    """urllib3 Retry that waits ``backoff_factor`` before the first retry and caps Retry-After."""
+
+    def get_backoff_time(self) -> float:
+        # urllib3 retries the first failure immediately; keep the retry_delay wait instead.
+        return max(super().get_backoff_time(), min(self.backoff_factor, self.backoff_max))
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.backoff_max)
+
+
+def configure_retries(
+    api_base: str,
+    max_retries: int,
+    retry_delay: float,
+    pool_maxsize: int = 2 * DEFAULT_MAX_CONCURRENCY,
+) -> None:
+    """Let urllib3 retry transient failures on the session with exponential backoff."""
+    retry = BackoffRetry(
+        total=max(max_retries - 1, 0),
+        backoff_factor=retry_delay,
+        backoff_max=RETRY_BACKOFF_MAX,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize, max_retries=retry)
+    SESSION.mount("https://", adapter)
+    # The streamed multipart body cannot be rewound by urllib3, so uploads keep
+    # their own retry loop (which also handles 409 conflicts). Share the pool so
+    # the upload connection is still reused by the share/link calls.
+    upload_adapter = HTTPAdapter(max_retries=0)
+    upload_adapter.poolmanager = adapter.poolmanager
+    SESSION.mount(f"{api_base}/upload", upload_adapter)
+
+
+def authorize_session(token: str) -> None:
+    SESSION.headers["Authorization"] = f"Zoho-oauthtoken {token}"
+
+
+def guess_content_type(name: str) -> str:
+    stem, ext = os.path.splitext(name.lower())
+    # Keep the inner suffix too so ".tar.gz" and ".gz" resolve independently.
+    key = os.path.splitext(stem)[1] + ext
+    content_type = _CONTENT_TYPES.get(key)
+    if content_type is None:
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        _CONTENT_TYPES[key] = content_type
+    return content_type
+
+
+def backoff_delay(base: float, attempt: int, cap: float = RETRY_BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff so concurrent runners don't retry in lockstep."""
+    return _RANDOM.uniform(0, min(cap, base * 2 ** (attempt - 1)))
 
 
 def generate_unique_name(original_name: str, counter: int) -> str:
@@ -175,126 +440,219 @@ def generate_unique_name(original_name: str, counter: int) -> str:
     return f"{stem}-{suffix}{ext}"
 
 
+@functools.lru_cache(maxsize=1)
+def list_folder_names(api_base: str, folder_id: str) -> Optional[Set[str]]:
+    """Names in the target folder from one listing page.
+
+    None when the listing can't be read or fills the page (the folder may hold
+    more), so only a complete listing is ever reused.
+    """
+    try:
+        response = SESSION.get(
+            f"{api_base}/files/{folder_id}/files",
+            headers={"Accept": JSONAPI_HEADERS["Accept"]},
+            params={"page[limit]": FOLDER_PAGE_LIMIT},
+            timeout=20,
+        )
+        response.raise_for_status()
+        items = loads_json(response.content)["data"]
+        if len(items) >= FOLDER_PAGE_LIMIT:
+            return None
+        return {item["attributes"]["name"] for item in items}
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return None
+
+
+def folder_names(api_base: str, folder_id: str) -> Optional[Set[str]]:
+    """The target folder's names, listed once per run and shared by concurrent uploads."""
+    with _FOLDER_NAMES_LOCK:
+        return list_folder_names(api_base, folder_id)
+
+
+def gzip_chunks(encoder: MultipartEncoder, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Stream the multipart body through gzip; requests sends it with chunked transfer encoding."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    while True:
+        chunk = encoder.read(chunk_size)
+        if not chunk:
+            break
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
 def upload_file(
     api_base: str,
-    token: str,
+    creds: Credentials,
     path: str,
     remote_name: Optional[str],
     conflict_mode: str,
     max_retries: int,
     retry_delay: float,
     enable_logs: bool,
+    compress: str = "never",
 ) -> Tuple[str, Optional[str], str]:
-    if not os.path.isfile(path):
-        sys.exit(color(f"❌ File not found: {path}", RED, True))
     url = f"{api_base}/upload"
     original_name = remote_name or os.path.basename(path)
     current_name = original_name
+    # Conflict renames keep the extension, so the type is fixed for every attempt.
+    content_type = guess_content_type(original_name)
     rename_counter = 0
     override_existing = False
+    reauthorized = False
+    existing: Optional[Set[str]] = None
+    use_gzip = compress == "always" or (
+        compress == "auto"
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and _GZIP_SUPPORT.get(api_base) is not False
+    )
 
-    while True:
-        for attempt in range(1, max_retries + 1):
+    try:
+        handle = open(path, "rb")
+    except (FileNotFoundError, IsADirectoryError):
+        sys.exit(color(f"❌ File not found: {path}", RED, True))
+
+    if hasattr(os, "posix_fadvise"):
+        # The body is streamed front to back (again on each retry); let the kernel read ahead.
+        try:
+            os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+    # For larger files, resolve name conflicts before sending the body rather
+    # than uploading it once only to be rejected with a 409. The 409 handling
+    # below still covers names the listing missed.
+    if os.fstat(handle.fileno()).st_size >= PREFLIGHT_MIN_BYTES:
+        existing = folder_names(api_base, creds.folder_id)
+        if existing is not None and current_name in existing:
+            if conflict_mode == "abort":
+                handle.close()
+                sys.exit(
+                    color(
+                        f"⚠️  File already exists: '{current_name}'. Set conflict_mode to rename or replace.",
+                        YELLOW,
+                        True,
+                    )
+                )
+            if conflict_mode == "replace":
+                log_line("🔁 Existing file detected; overriding in place.", MAGENTA, enable_logs)
+                override_existing = True
+            elif conflict_mode == "rename":
+                while current_name in existing and rename_counter < 10:
+                    rename_counter += 1
+                    current_name = generate_unique_name(original_name, rename_counter)
+                if current_name in existing:
+                    handle.close()
+                    sys.exit(color("❌ Too many rename attempts triggered by name conflicts.", RED, True))
+                log_line("♻️  Name already taken; uploading as '%s'.", MAGENTA, enable_logs, current_name)
+
+    # One POST per iteration. ``attempt`` only advances on transient failures, so
+    # conflict renames/overrides neither consume nor reset the retry budget.
+    attempt = 1
+    with handle:
+        while True:
             if attempt == 1:
-                message = f"⏳ Uploading '{current_name}'"
+                log_line("⏳ Uploading '%s'", CYAN, enable_logs, current_name)
             else:
-                message = f"⏳ Uploading '{current_name}' (attempt {attempt}/{max_retries})"
-            log_line(message, CYAN, enable_logs)
-            content_type, _ = mimetypes.guess_type(current_name)
-            data = {"parent_id": FOLDER_ID}
+                log_line("⏳ Uploading '%s' (attempt %d/%d)", CYAN, enable_logs, current_name, attempt, max_retries)
+            fields = {"parent_id": creds.folder_id}
             if override_existing:
-                data["override-name-exist"] = "true"
+                fields["override-name-exist"] = "true"
+            # Stream the multipart body from disk instead of letting requests
+            # buffer the whole file; rewind the shared handle for each attempt.
+            handle.seek(0)
+            fields["content"] = (current_name, handle, content_type)
+            encoder = MultipartEncoder(fields=fields)
+            headers = {"Content-Type": encoder.content_type}
+            if use_gzip:
+                headers["Content-Encoding"] = "gzip"
             try:
-                with open(path, "rb") as handle:
-                    files = {
-                        "content": (
-                            current_name,
-                            handle,
-                            content_type or "application/octet-stream",
-                        )
-                    }
-                    response = requests.post(
-                        url,
-                        headers=auth_header(token),
-                        files=files,
-                        data=data,
-                        timeout=120,
-                    )
+                response = SESSION.post(
+                    url,
+                    data=gzip_chunks(encoder) if use_gzip else encoder,
+                    headers=headers,
+                    timeout=120,
+                )
             except requests.RequestException as exc:
-                if attempt == max_retries:
+                if attempt >= max_retries:
                     sys.exit(color(f"❌ Upload failed: {exc}", RED, True))
-                log_line(f"🔁 Network error ({exc}); retrying in {retry_delay}s…", YELLOW, enable_logs)
-                time.sleep(retry_delay)
+                delay = backoff_delay(retry_delay, attempt)
+                log_line("🔁 Network error (%s); retrying in %.1fs…", YELLOW, enable_logs, exc, delay)
+                time.sleep(delay)
+                attempt += 1
                 continue
+            except OSError as exc:
+                sys.exit(color(f"❌ Could not read {path}: {exc}", RED, True))
 
             try:
                 response.raise_for_status()
             except requests.HTTPError:
                 status = response.status_code
+                if status == 401 and not reauthorized:
+                    # The session hook has swapped in a fresh token; resend once.
+                    log_line("🔁 Access token rejected; retrying with a refreshed token.", YELLOW, enable_logs)
+                    reauthorized = True
+                    continue
+                if status == 409 and conflict_mode == "replace":
+                    if override_existing:
+                        sys.exit(color(f"❌ Replace attempt failed again for '{current_name}'.", RED, True))
+                    log_line("🔁 Existing file detected; overriding in place.", MAGENTA, enable_logs)
+                    override_existing = True
+                    continue
+                if status == 409 and conflict_mode == "rename":
+                    rename_counter += 1
+                    if rename_counter > 10:
+                        sys.exit(color("❌ Too many rename attempts triggered by name conflicts.", RED, True))
+                    current_name = generate_unique_name(original_name, rename_counter)
+                    log_line("♻️  Conflict detected; retrying with '%s'.", MAGENTA, enable_logs, current_name)
+                    continue
                 if status == 409:
-                    if conflict_mode == "abort":
-                        sys.exit(
-                            color(
-                                f"⚠️  File already exists: '{current_name}'. Set conflict_mode to rename or replace.",
-                                YELLOW,
-                                True,
-                            )
+                    sys.exit(
+                        color(
+                            f"⚠️  File already exists: '{current_name}'. Set conflict_mode to rename or replace.",
+                            YELLOW,
+                            True,
                         )
-                    if conflict_mode == "replace":
-                        if override_existing:
-                            sys.exit(
-                                color(
-                                    f"❌ Replace attempt failed again for '{current_name}'.",
-                                    RED,
-                                    True,
-                                )
-                            )
-                        log_line("🔁 Existing file detected; overriding in place.", MAGENTA, enable_logs)
-                        override_existing = True
-                        break
-                    if conflict_mode == "rename":
-                        rename_counter += 1
-                        if rename_counter > 10:
-                            sys.exit(
-                                color(
-                                    "❌ Too many rename attempts triggered by name conflicts.",
-                                    RED,
-                                    True,
-                                )
-                            )
-                        new_name = generate_unique_name(original_name, rename_counter)
-                        log_line(f"♻️  Conflict detected; retrying with '{new_name}'.", MAGENTA, enable_logs)
-                        current_name = new_name
-                        break
-                elif status >= 500 and attempt < max_retries:
-                    log_line(
-                        f"🔁 Zoho responded with {status}; retrying in {retry_delay}s…",
-                        YELLOW,
-                        enable_logs,
                     )
-                    time.sleep(retry_delay)
+                if use_gzip and compress == "auto" and status == 415:
+                    # Concurrent uploads may already be in flight compressed; each falls back.
+                    _GZIP_SUPPORT[api_base] = False
+                    log_line("🔁 Compressed upload rejected; resending uncompressed.", YELLOW, enable_logs)
+                    use_gzip = False
                     continue
-                else:
-                    sys.exit(color(f"❌ Upload failed: {status} {response.text}", RED, True))
-            else:
-                payload = response.json()
-                try:
-                    item = payload["data"][0]
-                    attributes = item.get("attributes", {})
-                    resource_id = item.get("id") or attributes.get("resource_id")
-                    if not resource_id:
-                        raise KeyError("resource_id")
-                    permalink = attributes.get("Permalink")
-                    return resource_id, permalink, current_name
-                except Exception:
-                    sys.exit(color(f"❌ Unexpected upload response: {payload}", RED, True))
-        else:
-            sys.exit(color("❌ Upload failed after exhausting retries.", RED, True))
-        # conflict handled via break; loop to retry
-        continue
-
+                if (status == 429 or status >= 500) and attempt < max_retries:
+                    delay = backoff_delay(retry_delay, attempt)
+                    log_line("🔁 Zoho responded with %d; retrying in %.1fs…", YELLOW, enable_logs, status, delay)
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                sys.exit(color(f"❌ Upload failed: {status} {response.text}", RED, True))
 
-def share_everyone_view(api_base: str, token: str, resource_id: str, max_retries: int, retry_delay: float, enable_logs: bool) -> None:
+            try:
+                payload = loads_json(response.content)
+            except ValueError:
+                sys.exit(color(f"❌ Unexpected upload response: {response.text}", RED, True))
+            data = payload.get("data") if isinstance(payload, dict) else None
+            item = data[0] if isinstance(data, list) and data else None
+            if not isinstance(item, dict):
+                sys.exit(color(f"❌ Unexpected upload response: {payload}", RED, True))
+            attributes = item.get("attributes")
+            if not isinstance(attributes, dict):
+                attributes = {}
+            resource_id = item.get("id") or attributes.get("resource_id")
+            if not resource_id:
+                sys.exit(color(f"❌ Unexpected upload response: {payload}", RED, True))
+            if use_gzip:
+                _GZIP_SUPPORT[api_base] = True
+            if existing is not None:
+                # Later uploads in this run see the name without listing again.
+                with _FOLDER_NAMES_LOCK:
+                    existing.add(current_name)
+            return resource_id, attributes.get("Permalink"), current_name
+
+
+def share_everyone_view(api_base: str, resource_id: str, enable_logs: bool) -> None:
     url = f"{api_base}/permissions"
     payload = {
         "data": {
@@ -302,36 +660,58 @@ def share_everyone_view(api_base: str, token: str, resource_id: str, max_retries
             "attributes": {
                 "resource_id": resource_id,
                 "shared_type": "everyone",
-                "role_id": "34",  # View
+                "role_id": PUBLIC_VIEW_ROLE,
             },
         }
     }
-    headers = {
-        **auth_header(token),
-        "Accept": "application/vnd.api+json",
-        "Content-Type": "application/json",
-    }
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=20)
-            response.raise_for_status()
-            log_line("🌍 Public permissions applied.", GREEN, enable_logs)
-            return
-        except requests.HTTPError as http_err:
-            status = http_err.response.status_code
-            if status >= 500 and attempt < max_retries:
-                log_line(f"🔁 Share API error {status}; retrying in {retry_delay}s…", YELLOW, enable_logs)
-                time.sleep(retry_delay)
-                continue
-            sys.exit(color(f"❌ Share everyone failed: {status} {http_err.response.text}", RED, True))
-        except requests.RequestException as exc:
-            if attempt == max_retries:
-                sys.exit(color(f"❌ Share everyone failed: {exc}", RED, True))
-            log_line(f"🔁 Share request error ({exc}); retrying in {retry_delay}s…", YELLOW, enable_logs)
-            time.sleep(retry_delay)
+    try:
+        response = SESSION.post(url, headers=JSONAPI_HEADERS, json=payload, timeout=20)
+        response.raise_for_status()
+    except requests.HTTPError as http_err:
+        status = http_err.response.status_code
+        sys.exit(color(f"❌ Share everyone failed: {status} {http_err.response.text}", RED, True))
+    except requests.RequestException as exc:
+        sys.exit(color(f"❌ Share everyone failed: {exc}", RED, True))
+    log_line("🌍 Public permissions applied.", GREEN, enable_logs)
+
 
+@functools.lru_cache(maxsize=1)
+def _folder_grants_public_view(api_base: str, folder_id: str) -> bool:
+    try:
+        response = SESSION.get(
+            f"{api_base}/files/{folder_id}/permissions",
+            headers={"Accept": JSONAPI_HEADERS["Accept"]},
+            timeout=20,
+        )
+        response.raise_for_status()
+        permissions = loads_json(response.content)["data"]
+        return any(
+            item["attributes"].get("shared_type") == "everyone"
+            and str(item["attributes"].get("role_id")) == PUBLIC_VIEW_ROLE
+            for item in permissions
+        )
+    except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError):
+        return False
 
-def create_external_link(api_base: str, token: str, resource_id: str, max_retries: int, retry_delay: float, enable_logs: bool) -> str:
+
+def folder_shared_publicly(api_base: str, folder_id: str) -> bool:
+    """Whether the target folder already grants everyone view access, which new files inherit.
+
+    Looked up once per run (``main`` starts it alongside the uploads); any lookup
+    failure counts as "no" so files are shared explicitly.
+    """
+    with _FOLDER_PERMISSIONS_LOCK:
+        return _folder_grants_public_view(api_base, folder_id)
+
+
+def ensure_public_view(api_base: str, folder_id: str, resource_id: str, enable_logs: bool) -> None:
+    if folder_shared_publicly(api_base, folder_id):
+        log_line("🌍 Folder already shared with everyone; skipping share.", GREEN, enable_logs)
+        return
+    share_everyone_view(api_base, resource_id, enable_logs)
+
+
+def create_external_link(api_base: str, resource_id: str, enable_logs: bool) -> str:
     url = f"{api_base}/links"
     payload = {
         "data": {
@@ -345,43 +725,30 @@ def create_external_link(api_base: str, token: str, resource_id: str, max_retrie
             },
         }
     }
-    headers = {
-        **auth_header(token),
-        "Accept": "application/vnd.api+json",
-        "Content-Type": "application/json",
-    }
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            download_url = data["data"]["attributes"]["download_url"]
-            log_line(f"🔗 External download link created: {download_url}", GREEN, enable_logs)
-            return download_url
-        except requests.HTTPError as http_err:
-            status = http_err.response.status_code
-            if status >= 500 and attempt < max_retries:
-                log_line(f"🔁 Link API error {status}; retrying in {retry_delay}s…", YELLOW, enable_logs)
-                time.sleep(retry_delay)
-                continue
-            sys.exit(color(f"❌ Create link failed: {status} {http_err.response.text}", RED, True))
-        except requests.RequestException as exc:
-            if attempt == max_retries:
-                sys.exit(color(f"❌ Create link failed: {exc}", RED, True))
-            log_line(f"🔁 Link request error ({exc}); retrying in {retry_delay}s…", YELLOW, enable_logs)
-            time.sleep(retry_delay)
-    sys.exit(color("❌ Unable to create download link after retries.", RED, True))
+    try:
+        response = SESSION.post(url, headers=JSONAPI_HEADERS, json=payload, timeout=30)
+        response.raise_for_status()
+    except requests.HTTPError as http_err:
+        status = http_err.response.status_code
+        sys.exit(color(f"❌ Create link failed: {status} {http_err.response.text}", RED, True))
+    except requests.RequestException as exc:
+        sys.exit(color(f"❌ Create link failed: {exc}", RED, True))
+    try:
+        download_url = loads_json(response.content)["data"]["attributes"]["download_url"]
+    except (ValueError, KeyError, TypeError):  # ValueError covers both JSON backends' decode errors
+        sys.exit(color(f"❌ Unexpected link response: {response.text}", RED, True))
+    log_line("🔗 External download link created: %s", GREEN, enable_logs, download_url)
+    return download_url
 
 
 def compose_links(base_url: str, link_mode: str) -> Dict[str, Optional[str]]:
-    preview_url = base_url.replace("/download", "/preview", 1) if "/download" in base_url else base_url
-    sep = "&" if "?" in base_url else "?"
-    direct_url = f"{base_url}{sep}directDownload=true"
+    # Only build the variants the caller asked for.
     selected: Dict[str, Optional[str]] = {}
     if link_mode in ("both", "direct"):
-        selected["direct"] = direct_url
+        sep = "&" if "?" in base_url else "?"
+        selected["direct"] = f"{base_url}{sep}directDownload=true"
     if link_mode in ("both", "preview"):
-        selected["preview"] = preview_url
+        selected["preview"] = base_url.replace("/download", "/preview", 1)
     return selected
 
 
@@ -391,10 +758,19 @@ def build_html_snippet(direct_url: Optional[str]) -> Optional[str]:
     return f'<img src="{direct_url}" alt="WorkDrive asset" />'
 
 
+def outputs_path_for(args: argparse.Namespace) -> Optional[str]:
+    return args.github_output or os.getenv("GITHUB_OUTPUT")
+
+
 def append_outputs(path: str, pairs: Dict[str, str]) -> None:
-    with open(path, "a", encoding="utf-8") as handle:
-        for key, value in pairs.items():
-            handle.write(f"{key}={value}\n")
+    data = "".join(f"{key}={value}\n" for key, value in pairs.items()).encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:  # os.write may be partial; loop until everything is flushed
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 @dataclass
@@ -416,44 +792,31 @@ def output_full(
     api_base: str,
     enable_color: bool,
 ) -> None:
+    labels = STYLED_LABELS if enable_color else PLAIN_LABELS
     total = len(results)
+    blocks: List[str] = []
     for idx, result in enumerate(results, 1):
         prefix = "✅ Upload complete"
         if total > 1:
             prefix += f" [{idx}/{total}]"
-        print(color(prefix, GREEN, enable_color) + " — " + color(result.resource_id, BOLD, enable_color))
-        print(
-            "\n"
-            + color("📄 Remote filename", CYAN, enable_color)
-            + f": {result.remote_name}"
-        )
+        blocks.append(color(prefix, GREEN, enable_color) + " — " + color(result.resource_id, BOLD, enable_color))
+        blocks.append(f"\n{labels['remote']}: {result.remote_name}")
         direct = result.links.get("direct")
         preview = result.links.get("preview")
         if direct:
-            print(
-                "\n"
-                + color("⚡ Direct download", CYAN, enable_color)
-                + f": {direct}"
-            )
+            blocks.append(f"\n{labels['direct']}: {direct}")
         if preview:
-            print(
-                "\n"
-                + color("🖥️  WorkDrive share", BLUE, enable_color)
-                + f": {preview}"
-            )
+            blocks.append(f"\n{labels['preview']}: {preview}")
         if result.html_snippet:
-            print(
-                "\n"
-                + color("🧩 HTML embed", MAGENTA, enable_color)
-                + f":\n{result.html_snippet}"
-            )
+            blocks.append(f"\n{labels['html']}:\n{result.html_snippet}")
         if idx < total:
-            print("\n" + "-" * 40 + "\n")
-    print(
-        "\n"
-        + color("ℹ️  Context", YELLOW, enable_color)
-        + f": region={region.upper()} · share_mode={share_mode} · link_mode={link_mode} · api_base={api_base}"
+            blocks.append("\n" + "-" * 40 + "\n")
+    blocks.append(
+        f"\n{labels['context']}: region={region.upper()} · share_mode={share_mode}"
+        f" · link_mode={link_mode} · api_base={api_base}"
     )
+    # One write for the whole summary instead of a print() per block.
+    sys.stdout.write("\n".join(blocks) + "\n")
 
 
 def output_json(results: Sequence[UploadResult]) -> None:
@@ -479,11 +842,89 @@ def output_json(results: Sequence[UploadResult]) -> None:
             }
             for result in results
         ]
-    print(json.dumps(payload))
+    print(dumps_json(payload))
+
+
+def process_file(
+    index: int,
+    target_path: str,
+    args: argparse.Namespace,
+    api_base: str,
+    creds: Credentials,
+    log_enabled: bool,
+) -> UploadResult:
+    resource_id, permalink, final_remote_name = upload_file(
+        api_base=api_base,
+        creds=creds,
+        path=target_path,
+        remote_name=args.remote_name,
+        conflict_mode=args.conflict_mode,
+        max_retries=args.max_retries,
+        retry_delay=args.retry_delay,
+        enable_logs=log_enabled,
+        compress=args.compress,
+    )
+
+    log_line("📄 Remote filename for '%s': %s", CYAN, log_enabled, os.path.basename(target_path), final_remote_name)
+
+    links: Dict[str, Optional[str]] = {}
+    html_snippet: Optional[str] = None
+
+    if args.share_mode == "public":
+        # Both calls only need the resource id: share in the background while
+        # this thread creates the link, so their round trips overlap.
+        share_future = _SHARE_EXECUTOR.submit(ensure_public_view, api_base, creds.folder_id, resource_id, log_enabled)
+        base_link = create_external_link(api_base, resource_id, log_enabled)
+        share_future.result()
+        links = compose_links(base_link, args.link_mode)
+        # The snippet only surfaces in full/json stdout or the GITHUB_OUTPUT file.
+        if args.stdout_mode != "direct" or outputs_path_for(args):
+            html_snippet = build_html_snippet(links.get("direct"))
+    else:
+        if index == 1:
+            log_line("🔒 Skipping public share; using internal WorkDrive URL.", BLUE, log_enabled)
+        internal_link = permalink or f"https://workdrive.zoho.com/file/{resource_id}"
+        if args.link_mode in ("direct", "both"):
+            links["direct"] = internal_link
+            log_line(
+                "⚠️  Direct downloads require public sharing; emitting the WorkDrive permalink instead.",
+                YELLOW,
+                log_enabled,
+            )
+        if args.link_mode in ("preview", "both") or args.link_mode == "direct":
+            links["preview"] = internal_link
+
+    return UploadResult(
+        source_path=target_path,
+        resource_id=resource_id,
+        remote_name=final_remote_name,
+        links=links,
+        html_snippet=html_snippet,
+        permalink=permalink,
+    )
+
+
+def upload_many(
+    target_paths: Sequence[str],
+    args: argparse.Namespace,
+    api_base: str,
+    creds: Credentials,
+    log_enabled: bool,
+) -> List[UploadResult]:
+    """Upload files concurrently over the pooled session, keeping results in input order."""
+    if len(target_paths) == 1:
+        return [process_file(1, target_paths[0], args, api_base, creds, log_enabled)]
+    workers = min(args.max_concurrency, len(target_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(process_file, index, target_path, args, api_base, creds, log_enabled)
+            for index, target_path in enumerate(target_paths, 1)
+        ]
+        return [future.result() for future in futures]
 
 
 def main() -> None:
-    need("CLIENT_ID", "CLIENT_SECRET", "REFRESH_TOKEN", "FOLDER_ID")
+    creds = load_credentials()
 
     parser = argparse.ArgumentParser(
         description="Upload a file to Zoho WorkDrive and emit public URLs."
@@ -541,78 +982,51 @@ def main() -> None:
         "--retry-delay",
         type=float,
         default=float(os.getenv("ZOHO_RETRY_DELAY", "2")),
-        help="Delay in seconds between retries (default: 2).",
+        help="Base delay in seconds for the exponential retry backoff (default: 2).",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.getenv("ZOHO_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY))),
+        help=f"Files uploaded in parallel when several are given (1-{MAX_CONCURRENCY_LIMIT}, default: {DEFAULT_MAX_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=("auto", "never", "always"),
+        default=os.getenv("ZOHO_COMPRESS", "never"),
+        help="Gzip the upload body: never (default), auto for text-like files, or always.",
+    )
+    parser.add_argument(
+        "--cache-token",
+        action="store_true",
+        default=os.getenv("ZOHO_CACHE_TOKEN", "").lower() in ("1", "true", "yes"),
+        help="Cache the access token in $RUNNER_TEMP for later steps of the same job (off by default).",
     )
 
     args = parser.parse_args()
 
-    expanded_inputs = expand_input_paths(args.file_paths)
+    if not 1 <= args.max_concurrency <= MAX_CONCURRENCY_LIMIT:
+        sys.exit(color(f"❌ --max-concurrency must be between 1 and {MAX_CONCURRENCY_LIMIT}.", RED, True))
+
+    target_paths = expand_input_paths(args.file_paths)
 
-    if len(expanded_inputs) > 1 and args.remote_name:
+    if len(target_paths) > 1 and args.remote_name:
         sys.exit(color("❌ --remote-name can only be used when uploading a single file.", RED, True))
 
-    region, api_base, accounts_base = resolve_endpoints(args.region)
-    token = get_access_token(accounts_base)
+    region, api_base, accounts_base = resolve_endpoints(
+        args.region,
+        os.getenv("ZOHO_API_BASE"),
+        os.getenv("ZOHO_ACCOUNTS_BASE"),
+    )
+    configure_retries(api_base, args.max_retries, args.retry_delay, pool_maxsize=2 * args.max_concurrency)
+    authorize_session(get_access_token(accounts_base, creds, args.cache_token))
+    install_token_refresh(accounts_base, creds, args.cache_token)
     log_enabled = args.stdout_mode == "full"
 
-    target_paths = [resolve_file_path(path) for path in expanded_inputs]
-
-    results: List[UploadResult] = []
-
-    for index, target_path in enumerate(target_paths, 1):
-        resource_id, permalink, final_remote_name = upload_file(
-            api_base=api_base,
-            token=token,
-            path=target_path,
-            remote_name=args.remote_name,
-            conflict_mode=args.conflict_mode,
-            max_retries=args.max_retries,
-            retry_delay=args.retry_delay,
-            enable_logs=log_enabled,
-        )
-
-        log_line(
-            f"📄 Remote filename for '{os.path.basename(target_path)}': {final_remote_name}",
-            CYAN,
-            log_enabled,
-        )
-
-        links: Dict[str, Optional[str]] = {}
-        html_snippet: Optional[str] = None
-
-        if args.share_mode == "public":
-            share_everyone_view(
-                api_base, token, resource_id, args.max_retries, args.retry_delay, log_enabled
-            )
-            base_link = create_external_link(
-                api_base, token, resource_id, args.max_retries, args.retry_delay, log_enabled
-            )
-            links = compose_links(base_link, args.link_mode)
-            html_snippet = build_html_snippet(links.get("direct"))
-        else:
-            if index == 1:
-                log_line("🔒 Skipping public share; using internal WorkDrive URL.", BLUE, log_enabled)
-            internal_link = permalink or f"https://workdrive.zoho.com/file/{resource_id}"
-            if args.link_mode in ("direct", "both"):
-                links["direct"] = internal_link
-                log_line(
-                    "⚠️  Direct downloads require public sharing; emitting the WorkDrive permalink instead.",
-                    YELLOW,
-                    log_enabled,
-                )
-            if args.link_mode in ("preview", "both") or args.link_mode == "direct":
-                links["preview"] = internal_link
-
-        results.append(
-            UploadResult(
-                source_path=target_path,
-                resource_id=resource_id,
-                remote_name=final_remote_name,
-                links=links,
-                html_snippet=html_snippet,
-                permalink=permalink,
-            )
-        )
+    if args.share_mode == "public":
+        # Resolve the folder's permissions while the first uploads are in flight.
+        _SHARE_EXECUTOR.submit(folder_shared_publicly, api_base, creds.folder_id)
+    results = upload_many(target_paths, args, api_base, creds, log_enabled)
 
     primary_links: List[str] = []
     for result in results:
@@ -651,13 +1065,13 @@ def main() -> None:
             enable_color=True,
         )
 
-    outputs_path = args.github_output or os.getenv("GITHUB_OUTPUT")
+    outputs_path = outputs_path_for(args)
     if outputs_path:
         primary_result = results[0]
         to_write: Dict[str, str] = {
             "zoho_resource_id": primary_result.resource_id,
             "zoho_remote_name": primary_result.remote_name,
-            "zoho_results_json": json.dumps(
+            "zoho_results_json": dumps_json(
                 [
                     {
                         "source_path": result.source_path,